@@ -1,21 +1,38 @@
 import math
 import urllib.parse
-import urllib.request
-import json
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 
+from solve_vrp.http_pool import http_get_bytes, json_loads
+
+OR_OPT_MAX_CHAIN = 3
+OR_OPT_MAX_STOPS = 200
+# 2-opt restarts its O(n^2) scan after every move; past this many stops it costs seconds per route.
+TWO_OPT_MAX_STOPS = 200
+# Route-shape parameters tried by multi-start; 1.0 is classic Clarke-Wright and goes first so ties keep it.
+SAVINGS_MULTI_START_LAMBDAS = (1.0, 0.6, 0.8, 1.2, 1.4)
+EARTH_DIAMETER_KM = 12742.0
+_DEG_TO_RAD = math.pi / 180.0  # same factor math.radians applies
+OSRM_TABLE_CACHE_TTL_SEC = 3600.0
+OSRM_TABLE_CACHE_MAX_ENTRIES = 128
+# Upper bound on waiting for another solve's fetch of the same table (3 tries x 25 s + backoff).
+OSRM_TABLE_INFLIGHT_WAIT_SEC = 80.0
+
+# Successful OSRM tables keyed by request URL -> (expires_at, matrix_km); matrices are only read.
+_osrm_table_cache: Dict[str, Tuple[float, List[List[float]]]] = {}
+_osrm_table_lock = threading.Lock()
+# URLs currently being fetched; concurrent solves for the same table wait instead of refetching.
+_osrm_table_inflight: Dict[str, threading.Event] = {}
+
 
 def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-    lat1, lon1 = map(math.radians, a)
-    lat2, lon2 = map(math.radians, b)
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    h = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    )
-    return 6371.0 * 2 * math.asin(math.sqrt(h))
+    lat1 = a[0] * _DEG_TO_RAD
+    lat2 = b[0] * _DEG_TO_RAD
+    sin_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_dlon = math.sin((b[1] * _DEG_TO_RAD - a[1] * _DEG_TO_RAD) * 0.5)
+    h = sin_dlat**2 + math.cos(lat1) * math.cos(lat2) * sin_dlon**2
+    return EARTH_DIAMETER_KM * math.asin(math.sqrt(h))
 
 
 def route_distance_km(route: List[Dict]) -> float: 
@@ -42,7 +59,7 @@ class Node:
         self.lat = lat
         self.lng = lng
         self.demand = demand
-        self.payload = dict(payload) if payload is not None else {}
+        self.payload = payload if payload is not None else {}
         self.in_route: Optional["Route"] = None
         self.is_interior = False
         self.dn_edge: Optional["Edge"] = None
@@ -63,11 +80,35 @@ class Route:  # Represents a route starting and ending at the depot, with zero o
         self.cost = 0.0
         self.edges: List[Edge] = []
         self.demand = 0.0
+        self.is_merged = False
 
     def reverse(self) -> None:
         self.edges = [edge.inv_edge for edge in reversed(self.edges) if edge.inv_edge]
 
 
+def _direct_distance_matrix_km(points: List[Dict]) -> List[List[float]]:
+    # Convert every point once and mirror the upper triangle (haversine is symmetric).
+    lats = [p["lat"] * _DEG_TO_RAD for p in points]
+    lngs = [p["lng"] * _DEG_TO_RAD for p in points]
+    cos_lats = [math.cos(lat) for lat in lats]
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+    size = len(points)
+    matrix = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        lat_i = lats[i]
+        lng_i = lngs[i]
+        cos_i = cos_lats[i]
+        row_i = matrix[i]
+        for j in range(i + 1, size):
+            sin_dlat = sin((lats[j] - lat_i) * 0.5)
+            sin_dlng = sin((lngs[j] - lng_i) * 0.5)
+            h = sin_dlat**2 + cos_i * cos_lats[j] * sin_dlng**2
+            distance = EARTH_DIAMETER_KM * asin(sqrt(h))
+            row_i[j] = distance
+            matrix[j][i] = distance
+    return matrix
+
+
 def build_distance_matrix_km( # Exposed for testing purposes, not part of the public API.
     points: List[Dict], distance_mode: str, osrm_base_url: str
 ) -> List[List[float]]:
@@ -79,26 +120,63 @@ def _build_distance_matrix_km_with_meta(  # Internal function that returns both
     points: List[Dict], distance_mode: str, osrm_base_url: str
 ) -> Tuple[List[List[float]], Dict[str, Optional[str]]]:
     if distance_mode == "direct":
-        return [
-            [
-                haversine_km((a["lat"], a["lng"]), (b["lat"], b["lng"]))
-                for b in points
-            ]
-            for a in points
-        ], {"distance_source": "direct", "warning": None}
+        return _direct_distance_matrix_km(points), {"distance_source": "direct", "warning": None}
 
-    coords = ";".join(f"{p['lng']},{p['lat']}" for p in points)
+    # OSRM parses coordinates into 1e-6 degree fixed point, so 6 decimals moves a point by at
+    # most one fixed-point step (~0.1 m) in rare halfway cases and leaves the table otherwise
+    # unchanged, while shortening the URL and letting nearby float noise share a cache entry.
+    coords = ";".join(f"{float(p['lng']):.6f},{float(p['lat']):.6f}" for p in points)
     encoded_coords = urllib.parse.quote(coords, safe=";,")
     base = osrm_base_url.rstrip("/")
     url = f"{base}/table/v1/driving/{encoded_coords}?annotations=distance"
 
+    owned = None
+    with _osrm_table_lock:
+        cached = _osrm_table_cache.get(url)
+        pending = None
+        if cached is None or cached[0] <= time.monotonic():
+            pending = _osrm_table_inflight.get(url)
+            if pending is None:
+                owned = _osrm_table_inflight[url] = threading.Event()
+    if pending is not None:
+        pending.wait(OSRM_TABLE_INFLIGHT_WAIT_SEC)
+        with _osrm_table_lock:
+            cached = _osrm_table_cache.get(url)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1], {"distance_source": "osrm", "warning": None}
+
+    try:
+        matrix_km, warning = _fetch_osrm_table_km(url)
+        if matrix_km is not None:
+            with _osrm_table_lock:
+                _osrm_table_cache.pop(url, None)
+                while len(_osrm_table_cache) >= OSRM_TABLE_CACHE_MAX_ENTRIES:
+                    _osrm_table_cache.pop(next(iter(_osrm_table_cache)), None)
+                _osrm_table_cache[url] = (time.monotonic() + OSRM_TABLE_CACHE_TTL_SEC, matrix_km)
+    finally:
+        if owned is not None:
+            with _osrm_table_lock:
+                _osrm_table_inflight.pop(url, None)
+            owned.set()
+
+    if matrix_km is None:
+        # Keep the solve path available even when public OSRM is overloaded.
+        return _direct_distance_matrix_km(points), {
+            "distance_source": "direct_fallback",
+            "warning": warning,
+        }
+    return matrix_km, {"distance_source": "osrm", "warning": None}
+
+
+def _fetch_osrm_table_km(url: str) -> Tuple[Optional[List[List[float]]], Optional[str]]: # Fetches an OSRM table as km, or (None, warning) when it is unavailable or malformed.
     data = None
     last_exc = None
     for attempt in range(3):
     # Retry up to 3 times with exponential backoff if OSRM request fails, to handle transient issues with the public OSRM service.
         try:
-            with urllib.request.urlopen(url, timeout=25) as response: # 25 second timeout to allow for larger tables to be processed by OSRM
-                data = json.loads(response.read().decode("utf-8"))
+            # 25 second timeout to allow for larger tables to be processed by OSRM; the pooled
+            # keep-alive connection skips the TCP/TLS handshake on repeat solves.
+            data = json_loads(http_get_bytes(url, 25))
             break
         except Exception as exc:
             last_exc = exc
@@ -106,37 +184,25 @@ def _build_distance_matrix_km_with_meta(  # Internal function that returns both
                 time.sleep(0.35 * (attempt + 1))
 
     if data is None:
-        # Keep the solve path available even when public OSRM is overloaded.
-        return [
-            [
-                haversine_km((a["lat"], a["lng"]), (b["lat"], b["lng"]))
-                for b in points
-            ]
-            for a in points
-        ], {
-            "distance_source": "direct_fallback",
-            "warning": f"OSRM table unavailable, using direct distances. Reason: {last_exc}",
-        }
+        return None, f"OSRM table unavailable, using direct distances. Reason: {last_exc}"
 
     if data.get("code") != "Ok" or "distances" not in data:
-        return [
-            [
-                haversine_km((a["lat"], a["lng"]), (b["lat"], b["lng"]))
-                for b in points
-            ]
-            for a in points
-        ], {
-            "distance_source": "direct_fallback",
-            "warning": "OSRM returned invalid table payload, using direct distances.",
-        }
+        return None, "OSRM returned invalid table payload, using direct distances."
 
+    # Missing cells (null, or NaN/Infinity from a lenient JSON parser) become +inf, i.e. no road.
+    # Savings built from such a table are then finite or -inf, never NaN, so they sort in one
+    # total order and the savings capacity pruning keeps the routes of the unpruned loop.
     matrix_m = data["distances"]
     matrix_km = []
+    isfinite = math.isfinite
     for row in matrix_m:
         matrix_km.append(
-            [float("inf") if value is None else float(value) / 1000.0 for value in row]
+            [
+                float(value) / 1000.0 if value is not None and isfinite(value) else math.inf
+                for value in row
+            ]
         )
-    return matrix_km, {"distance_source": "osrm", "warning": None}
+    return matrix_km, None
 
 
 def route_distance_from_matrix_km( # Computes route distance using the provided distance matrix, falling back to haversine if any leg is missing.
@@ -164,6 +230,21 @@ def route_distance_from_matrix_km( # Computes route distance using the provided
     return total
 
 
+def route_distance_from_sequence_km( # Like route_distance_from_matrix_km, but for a route already expressed as matrix indices.
+    sequence: List[int], points: List[Dict], distance_matrix_km: List[List[float]]
+) -> float:
+    total = 0.0
+    for ai, bi in zip(sequence, sequence[1:]):
+        leg = distance_matrix_km[ai][bi]
+        if math.isinf(leg):
+            a = points[ai]
+            b = points[bi]
+            total += haversine_km((a["lat"], a["lng"]), (b["lat"], b["lng"]))
+        else:
+            total += leg
+    return total
+
+
 def _check_merging_conditions( # Checks if two routes can be merged based on the Clarke-Wright conditions.
     i_node: Node, j_node: Node, i_route: Route, j_route: Route, capacity: int
 ) -> bool:
@@ -186,20 +267,21 @@ def _get_depot_edge(a_route: Route, a_node: Node, depot: Node) -> Edge: # Gets t
 
 
 def _route_stops(route: Route, depot: Node) -> List[Dict]: # Converts a Route object into a list of stops (dicts) starting and ending with the depot.
+    # Stops reference the caller's dicts; the result is read-only and serialized as-is.
     if not route.edges:
-        return [dict(depot.payload), dict(depot.payload)]
+        return [depot.payload, depot.payload]
 
     if route.edges[0].origin is not depot:
         route.reverse()
 
-    stops = [dict(route.edges[0].origin.payload)]
+    stops = [route.edges[0].origin.payload]
     for edge in route.edges:
-        stops.append(dict(edge.end.payload))
+        stops.append(edge.end.payload)
 
     if stops[0].get("id") != depot.ID:
-        stops.insert(0, dict(depot.payload))
+        stops.insert(0, depot.payload)
     if stops[-1].get("id") != depot.ID:
-        stops.append(dict(depot.payload))
+        stops.append(depot.payload)
     return stops
 
 
@@ -213,6 +295,7 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
     capacity: int,
     distance_matrix_km: List[List[float]],
     idx_by_id: Dict,
+    savings_lambda: float = 1.0,
 ) -> Tuple[List[Route], Node]: #
     # Create depot node and customer nodes
     depot_node = Node(
@@ -248,25 +331,50 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
         node.nd_edge = nd_edge
 
     # Calculate savings for every pair of customers (how much distance is saved by connecting them directly)
-    savings_list: List[Edge] = []
-    for i in range(1, len(nodes) - 1):
-        i_node = nodes[i]
-        i_idx = idx_by_id[i_node.ID]
-        for j in range(i + 1, len(nodes)):
-            j_node = nodes[j]
-            j_idx = idx_by_id[j_node.ID]
-
-            ij_edge = Edge(i_node, j_node, distance_matrix_km[i_idx][j_idx])
-            ji_edge = Edge(j_node, i_node, distance_matrix_km[j_idx][i_idx])
-            ij_edge.inv_edge = ji_edge
-            ji_edge.inv_edge = ij_edge
-
-            ij_edge.savings = i_node.nd_edge.cost + j_node.dn_edge.cost - ij_edge.cost
-            ji_edge.savings = j_node.nd_edge.cost + i_node.dn_edge.cost - ji_edge.cost
-            savings_list.extend((ij_edge, ji_edge))
-
-    # Sort savings in descending order (most beneficial merges first)
-    savings_list.sort(key=lambda edge: edge.savings, reverse=True)
+    # Matrix indices and depot legs are pulled into parallel lists so the pair loop avoids dict/attribute lookups.
+    node_idx = [idx_by_id[node.ID] for node in nodes]
+    dn_costs = [0.0] + [node.dn_edge.cost for node in nodes[1:]]
+    nd_costs = [0.0] + [node.nd_edge.cost for node in nodes[1:]]
+    demands = [node.demand for node in nodes]
+    # With non-negative demands a route weighs at least its nodes, so a pair that exceeds
+    # capacity on its own can never pass the merge check; such pairs are skipped up front.
+    prune_by_capacity = min(demands) >= 0.0
+    # later_min_demand[i] is the smallest demand among nodes[i:], so a customer that cannot
+    # pair even with the lightest later one skips its whole row without a per-pair check.
+    # later_max_demand[i] is the largest; when even that partner fits, every pair in the row
+    # does and the per-pair check is skipped (always the case with uniform demands that fit).
+    later_min_demand = demands + [math.inf]
+    later_max_demand = demands + [-math.inf]
+    for k in range(len(nodes) - 1, 0, -1):
+        later_min_demand[k] = min(demands[k], later_min_demand[k + 1])
+        later_max_demand[k] = max(demands[k], later_max_demand[k + 1])
+    # Savings live in flat lists (value + origin * n_nodes + end) rather than one Edge pair per
+    # customer pair; Edges are only created for the few candidates that actually merge.
+    n_nodes = len(nodes)
+    savings: List[float] = []
+    pair_codes: List[int] = []
+    for i in range(1, n_nodes - 1):
+        i_demand = demands[i]
+        if prune_by_capacity and i_demand + later_min_demand[i + 1] > capacity:
+            continue
+        check_pairs = prune_by_capacity and i_demand + later_max_demand[i + 1] > capacity
+        i_idx = node_idx[i]
+        i_row = distance_matrix_km[i_idx]
+        i_nd_cost = nd_costs[i]
+        i_dn_cost = dn_costs[i]
+        i_code = i * n_nodes
+        for j in range(i + 1, n_nodes):
+            if check_pairs and i_demand + demands[j] > capacity:
+                continue
+            j_idx = node_idx[j]
+            savings.append(i_nd_cost + dn_costs[j] - savings_lambda * i_row[j_idx])
+            savings.append(nd_costs[j] + i_dn_cost - savings_lambda * distance_matrix_km[j_idx][i_idx])
+            pair_codes.append(i_code + j)
+            pair_codes.append(j * n_nodes + i)
+
+    # Sort savings in descending order (most beneficial merges first); the sort is stable,
+    # so equal savings keep their generation order exactly as the Edge-list sort did.
+    savings_order = sorted(range(len(savings)), key=savings.__getitem__, reverse=True)
 
     # Start with each customer in its own route (depot -> customer -> depot)
     routes: List[Route] = []
@@ -282,10 +390,16 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
         routes.append(route)
 
     # Try to merge routes using the best savings, as long as constraints are satisfied
-    while savings_list:
-        ij_edge = savings_list.pop(0)
-        i_node = ij_edge.origin
-        j_node = ij_edge.end
+    # Walk the sorted list in place; popping from the front is O(len) per merge candidate.
+    # interior[k] mirrors nodes[k].is_interior; a customer never becomes an endpoint again,
+    # so most late candidates are rejected on two list reads before any Node is touched.
+    interior = [False] * n_nodes
+    for position in savings_order:
+        i, j = divmod(pair_codes[position], n_nodes)
+        if interior[i] or interior[j]:
+            continue
+        i_node = nodes[i]
+        j_node = nodes[j]
         i_route = i_node.in_route
         j_route = j_node.in_route
 
@@ -300,7 +414,7 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
         i_route.edges.remove(i_edge)
         i_route.cost -= i_edge.cost
         if len(i_route.edges) > 1:
-            i_node.is_interior = True
+            i_node.is_interior = interior[i] = True
         if i_route.edges and i_route.edges[0].origin is not depot_node:
             i_route.reverse()
 
@@ -308,11 +422,18 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
         j_route.edges.remove(j_edge)
         j_route.cost -= j_edge.cost
         if len(j_route.edges) > 1:
-            j_node.is_interior = True
+            j_node.is_interior = interior[j] = True
         if j_route.edges and j_route.edges[0].origin is depot_node:
             j_route.reverse()
 
         # Merge j_route into i_route via the savings edge
+        i_idx = node_idx[i]
+        j_idx = node_idx[j]
+        ij_edge = Edge(i_node, j_node, distance_matrix_km[i_idx][j_idx])
+        ji_edge = Edge(j_node, i_node, distance_matrix_km[j_idx][i_idx])
+        ij_edge.inv_edge = ji_edge
+        ji_edge.inv_edge = ij_edge
+        ij_edge.savings = savings[position]
         i_route.edges.append(ij_edge)
         i_route.cost += ij_edge.cost
         i_route.demand += j_node.demand
@@ -325,11 +446,150 @@ def _build_clarke_wright_routes( # Builds initial routes using the Clarke-Wright
             i_route.demand += edge.end.demand
             edge.end.in_route = i_route
 
-        # Remove the merged route from the list
-        routes.remove(j_route)
+        # Flag the merged route; the list is compacted once after all merges
+        j_route.is_merged = True
 
     # Return the list of routes and the depot node
-    return routes, depot_node
+    return [route for route in routes if not route.is_merged], depot_node
+
+
+def _two_opt_sequence( # Improves a depot-to-depot index sequence with first-improvement 2-opt moves.
+    sequence: List[int], distance_matrix_km: List[List[float]]
+) -> List[int]:
+    tour = list(sequence)
+    size = len(tour)
+    if size < 4:
+        return tour
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, size - 2):
+            a = tour[i - 1]
+            b = tour[i]
+            # Inner legs are summed in both directions so OSRM (asymmetric) matrices stay exact.
+            forward = 0.0
+            backward = 0.0
+            for j in range(i + 1, size - 1):
+                c = tour[j]
+                d = tour[j + 1]
+                forward += distance_matrix_km[tour[j - 1]][c]
+                backward += distance_matrix_km[c][tour[j - 1]]
+                delta = (
+                    distance_matrix_km[a][c]
+                    + backward
+                    + distance_matrix_km[b][d]
+                    - distance_matrix_km[a][b]
+                    - forward
+                    - distance_matrix_km[c][d]
+                )
+                if delta < -1e-9:
+                    tour[i : j + 1] = reversed(tour[i : j + 1])
+                    improved = True
+                    break
+            if improved:
+                break
+    return tour
+
+
+def _or_opt_sequence( # Relocates chains of 1-3 customers to cheaper positions, keeping chain direction.
+    sequence: List[int], distance_matrix_km: List[List[float]]
+) -> List[int]:
+    tour = list(sequence)
+    improved = True
+    while improved:
+        improved = False
+        for chain_len in range(1, OR_OPT_MAX_CHAIN + 1):
+            for i in range(1, len(tour) - chain_len):
+                chain = tour[i : i + chain_len]
+                prev_idx = tour[i - 1]
+                next_idx = tour[i + chain_len]
+                removal_gain = (
+                    distance_matrix_km[prev_idx][chain[0]]
+                    + distance_matrix_km[chain[-1]][next_idx]
+                    - distance_matrix_km[prev_idx][next_idx]
+                )
+                remaining = tour[:i] + tour[i + chain_len :]
+                for k in range(len(remaining) - 1):
+                    if k == i - 1:
+                        continue
+                    p = remaining[k]
+                    q = remaining[k + 1]
+                    insertion_cost = (
+                        distance_matrix_km[p][chain[0]]
+                        + distance_matrix_km[chain[-1]][q]
+                        - distance_matrix_km[p][q]
+                    )
+                    if insertion_cost - removal_gain < -1e-9:
+                        tour = remaining[: k + 1] + chain + remaining[k + 1 :]
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+    return tour
+
+
+def _sequence_cost(sequence: List[int], distance_matrix_km: List[List[float]]) -> float:
+    return sum(
+        distance_matrix_km[sequence[i]][sequence[i + 1]] for i in range(len(sequence) - 1)
+    )
+
+
+def _improve_route_sequence( # Alternates the enabled neighbourhoods until neither shortens the route.
+    sequence: List[int],
+    distance_matrix_km: List[List[float]],
+    two_opt: bool,
+    or_opt: bool,
+) -> List[int]:
+    best_cost = _sequence_cost(sequence, distance_matrix_km)
+    while True:
+        if two_opt and len(sequence) <= TWO_OPT_MAX_STOPS:
+            sequence = _two_opt_sequence(sequence, distance_matrix_km)
+        if or_opt and len(sequence) <= OR_OPT_MAX_STOPS:
+            sequence = _or_opt_sequence(sequence, distance_matrix_km)
+        cost = _sequence_cost(sequence, distance_matrix_km)
+        if not cost < best_cost - 1e-9:
+            return sequence
+        best_cost = cost
+
+
+def _plan_route_sequences( # Builds, selects and polishes routes for one savings shape, as depot-to-depot index sequences.
+    depot: Dict,
+    customers: List[Dict],
+    vehicles: int,
+    capacity: int,
+    distance_matrix_km: List[List[float]],
+    idx_by_id: Dict,
+    two_opt: bool,
+    or_opt: bool,
+    savings_lambda: float,
+) -> List[List[int]]:
+    cw_routes, depot_node = _build_clarke_wright_routes(
+        depot, customers, capacity, distance_matrix_km, idx_by_id, savings_lambda
+    )
+
+    selected_routes = list(cw_routes)
+    if len(selected_routes) > vehicles:
+        selected_routes.sort(
+            key=lambda route: (
+                -_route_customer_count(route, depot_node),
+                -route.demand,
+                route.cost,
+            )
+        )
+        selected_routes = selected_routes[:vehicles]
+
+    sequences = []
+    for route_obj in selected_routes:
+        sequence = [idx_by_id[stop["id"]] for stop in _route_stops(route_obj, depot_node)]
+        if (two_opt or or_opt) and len(sequence) > 3:
+            sequence = _improve_route_sequence(
+                sequence, distance_matrix_km, two_opt, or_opt
+            )
+        sequences.append(sequence)
+    return sequences
 
 
 def solve_vrp_nearest_neighbor(
@@ -339,6 +599,9 @@ def solve_vrp_nearest_neighbor(
     capacity: int,
     distance_mode: str = "direct",
     osrm_base_url: str = "https://router.project-osrm.org",
+    two_opt: bool = True,
+    or_opt: bool = True,
+    multi_start: bool = False,
 ) -> Dict:
     if distance_mode not in {"direct", "osrm"}:
         raise RuntimeError("distance_mode must be either 'direct' or 'osrm'.")
@@ -346,11 +609,11 @@ def solve_vrp_nearest_neighbor(
     distance_source = "direct" if distance_mode == "direct" else "osrm"
 
     eligible_customers = [
-        dict(customer)
+        customer
         for customer in customers
         if float(customer.get("demand", 1)) <= capacity
     ]
-    points = [dict(depot)] + eligible_customers
+    points = [depot] + eligible_customers
     idx_by_id = {point["id"]: idx for idx, point in enumerate(points)}
 
     if len(points) > 1:
@@ -373,7 +636,7 @@ def solve_vrp_nearest_neighbor(
             reachable_customers.append(customer)
 
     if len(reachable_customers) != len(eligible_customers):
-        points = [dict(depot)] + reachable_customers
+        points = [depot] + reachable_customers
         idx_by_id = {point["id"]: idx for idx, point in enumerate(points)}
         if len(points) > 1:
             distance_matrix_km, matrix_meta = _build_distance_matrix_km_with_meta(
@@ -386,36 +649,37 @@ def solve_vrp_nearest_neighbor(
         else:
             distance_matrix_km = [[0.0]]
 
-    cw_routes: List[Route] = []
-    depot_node = Node(
-        depot["id"],
-        float(depot["lat"]),
-        float(depot["lng"]),
-        0.0,
-        payload=depot,
-    )
+    # Multi-start reruns the savings build with different route shapes and keeps the plan
+    # serving the most customers, then the shortest polished distance.
+    route_sequences: List[List[int]] = []
     if reachable_customers:
-        cw_routes, depot_node = _build_clarke_wright_routes(
-            depot, reachable_customers, capacity, distance_matrix_km, idx_by_id
-        )
-
-    selected_routes = list(cw_routes)
-    if len(selected_routes) > vehicles:
-        selected_routes.sort(
-            key=lambda route: (
-                -_route_customer_count(route, depot_node),
-                -route.demand,
-                route.cost,
+        best_score = None
+        for savings_lambda in SAVINGS_MULTI_START_LAMBDAS if multi_start else (1.0,):
+            sequences = _plan_route_sequences(
+                depot,
+                reachable_customers,
+                vehicles,
+                capacity,
+                distance_matrix_km,
+                idx_by_id,
+                two_opt,
+                or_opt,
+                savings_lambda,
             )
-        )
-        selected_routes = selected_routes[:vehicles]
+            score = (
+                -sum(len(sequence) - 2 for sequence in sequences),
+                sum(_sequence_cost(sequence, distance_matrix_km) for sequence in sequences),
+            )
+            if best_score is None or score < best_score:
+                best_score = score
+                route_sequences = sequences
 
     routes = []
     served_customer_ids = set()
     for vehicle_id in range(vehicles):
-        if vehicle_id < len(selected_routes):
-            route_obj = selected_routes[vehicle_id]
-            stops = _route_stops(route_obj, depot_node)
+        if vehicle_id < len(route_sequences):
+            sequence = route_sequences[vehicle_id]
+            stops = [points[idx] for idx in sequence]
             served_ids = [
                 stop["id"] for stop in stops if stop.get("id") != depot.get("id")
             ]
@@ -423,7 +687,8 @@ def solve_vrp_nearest_neighbor(
                 served_customer_ids.add(served_id)
             used = sum(float(stop.get("demand", 0)) for stop in stops[1:-1])
         else:
-            stops = [dict(depot), dict(depot)]
+            sequence = [0, 0]
+            stops = [depot, depot]
             served_ids = []
             used = 0.0
 
@@ -433,7 +698,7 @@ def solve_vrp_nearest_neighbor(
                 "capacity": capacity,
                 "used": int(used) if float(used).is_integer() else round(used, 3),
                 "distance_km": round(
-                    route_distance_from_matrix_km(stops, idx_by_id, distance_matrix_km),
+                    route_distance_from_sequence_km(sequence, points, distance_matrix_km),
                     3,
                 ),
                 "stops": stops,
@@ -10,6 +10,7 @@ DEFAULT_TRAFFIC_RADIUS_M = 300
 DEFAULT_FORECAST_WINDOW_HOURS = 24
 DEFAULT_FORECAST_STEP_MIN = 120
 EARTH_RADIUS_KM = 6371.0
+_DEG_TO_RAD = math.pi / 180.0  # same factor math.radians applies
 
 
 def _to_iso_z(dt: Optional[datetime]) -> Optional[str]:
@@ -32,14 +33,11 @@ def _safe_float(value: Any) -> Optional[float]:
 
 
 def _haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-    lat1, lon1 = map(math.radians, a)
-    lat2, lon2 = map(math.radians, b)
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    h = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    )
+    lat1 = a[0] * _DEG_TO_RAD
+    lat2 = b[0] * _DEG_TO_RAD
+    sin_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_dlon = math.sin((b[1] * _DEG_TO_RAD - a[1] * _DEG_TO_RAD) * 0.5)
+    h = sin_dlat**2 + math.cos(lat1) * math.cos(lat2) * sin_dlon**2
     return EARTH_RADIUS_KM * 2.0 * math.asin(math.sqrt(h))
 
 
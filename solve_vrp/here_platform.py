@@ -1,14 +1,26 @@
 from datetime import datetime, timedelta, timezone
-import json
+import threading
+import time
 import urllib.parse
-import urllib.request
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from solve_vrp.http_pool import http_get_bytes as _http_get_bytes, json_loads
+
 
 DEFAULT_TIMEOUT_SEC = 12
 DEFAULT_TRAFFIC_RADIUS_M = 300
 DEFAULT_FORECAST_WINDOW_HOURS = 24
 DEFAULT_FORECAST_STEP_MIN = 120
+SHARED_HTTP_CACHE_TTL_SEC = 300.0
+SHARED_HTTP_CACHE_MAX_ENTRIES = 4096
+
+# Parsed HERE payloads shared across client instances (one client is built per request),
+# keyed by full request URL -> (expires_at, payload). Payloads are treated as read-only.
+_shared_http_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_shared_http_cache_lock = threading.Lock()
+# URL -> Event set once the thread fetching it has finished, so concurrent callers wait
+# for that response instead of issuing the same request again.
+_inflight_requests: Dict[str, threading.Event] = {}
 
 
 def _safe_float(value: Any) -> Optional[float]:
@@ -223,6 +235,12 @@ class HerePlatformClient:
             "routing_queries": 0,
             "errors": 0,
         }
+        # Prefetch may call one client from several threads; += on a dict item is not atomic.
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
 
     def _get_json(
         self,
@@ -238,19 +256,48 @@ class HerePlatformClient:
 
         cached = self._http_cache.get(full_url)
         if cached is not None:
-            self._stats["cache_hits"] += 1
+            self._count("cache_hits")
             return cached
 
-        request = urllib.request.Request(full_url, method="GET")
+        now = time.monotonic()
+        owned = None
+        pending = None
+        with _shared_http_cache_lock:
+            shared = _shared_http_cache.get(full_url)
+            if shared is None or shared[0] <= now:
+                pending = _inflight_requests.get(full_url)
+                if pending is None:
+                    owned = _inflight_requests[full_url] = threading.Event()
+        if pending is not None:
+            # Another thread (e.g. a /prefetch_here warm-up) is fetching this URL; wait for it.
+            pending.wait(self.timeout_sec)
+            now = time.monotonic()
+            with _shared_http_cache_lock:
+                shared = _shared_http_cache.get(full_url)
+        if shared is not None and shared[0] > now:
+            self._http_cache[full_url] = shared[1]
+            self._count("cache_hits")
+            return shared[1]
+
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout_sec) as response:
-                payload = json.loads(response.read().decode("utf-8"))
-        except Exception as exc:
-            self._stats["errors"] += 1
-            raise RuntimeError(f"HERE request failed for {url}: {exc}") from exc
-
-        self._http_cache[full_url] = payload
-        self._stats["http_requests"] += 1
+            try:
+                payload = json_loads(_http_get_bytes(full_url, self.timeout_sec))
+            except Exception as exc:
+                self._count("errors")
+                raise RuntimeError(f"HERE request failed for {url}: {exc}") from exc
+
+            self._http_cache[full_url] = payload
+            with _shared_http_cache_lock:
+                _shared_http_cache.pop(full_url, None)
+                while len(_shared_http_cache) >= SHARED_HTTP_CACHE_MAX_ENTRIES:
+                    _shared_http_cache.pop(next(iter(_shared_http_cache)))
+                _shared_http_cache[full_url] = (now + SHARED_HTTP_CACHE_TTL_SEC, payload)
+        finally:
+            if owned is not None:
+                with _shared_http_cache_lock:
+                    _inflight_requests.pop(full_url, None)
+                owned.set()
+        self._count("http_requests")
         return payload
 
     def _extract_weather_observation(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -316,7 +363,7 @@ class HerePlatformClient:
         cache_key = (round(lat, 4), round(lng, 4), _to_utc_hour(reference_time))
         cached = self._weather_cache.get(cache_key)
         if cached is not None:
-            self._stats["cache_hits"] += 1
+            self._count("cache_hits")
             return cached
 
         payload = self._get_json(
@@ -328,7 +375,7 @@ class HerePlatformClient:
             },
             key_param="apiKey",
         )
-        self._stats["weather_queries"] += 1
+        self._count("weather_queries")
 
         observation = self._extract_weather_observation(payload)
         if observation is None:
@@ -495,7 +542,7 @@ class HerePlatformClient:
         cache_key = (round(lat, 4), round(lng, 4), self.traffic_radius_m)
         cached = self._traffic_cache.get(cache_key)
         if cached is not None:
-            self._stats["cache_hits"] += 1
+            self._count("cache_hits")
             return cached
 
         in_filter = f"circle:{lat:.6f},{lng:.6f};r={self.traffic_radius_m}"
@@ -510,7 +557,7 @@ class HerePlatformClient:
             {"in": in_filter, "locationReferencing": "shape"},
             key_param="apiKey",
         )
-        self._stats["traffic_queries"] += 1
+        self._count("traffic_queries")
 
         flow_rows = flow_payload.get("results")
         if not isinstance(flow_rows, list):
@@ -567,7 +614,7 @@ class HerePlatformClient:
         )
         cached = self._routing_cache.get(cache_key)
         if cached is not None:
-            self._stats["cache_hits"] += 1
+            self._count("cache_hits")
             return cached
 
         payload = self._get_json(
@@ -582,7 +629,7 @@ class HerePlatformClient:
             },
             key_param=None,
         )
-        self._stats["routing_queries"] += 1
+        self._count("routing_queries")
 
         routes = payload.get("routes")
         if not isinstance(routes, list) or not routes:
@@ -669,4 +716,5 @@ class HerePlatformClient:
         }
 
     def stats(self) -> Dict[str, Any]:
-        return dict(self._stats)
+        with self._stats_lock:
+            return dict(self._stats)
@@ -0,0 +1,107 @@
+import atexit
+import http.client
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, List, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # solve_vrp stays usable without the Function app's requirements
+    from json import loads as json_loads
+
+MAX_IDLE_CONNECTIONS_PER_HOST = 32
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Same User-Agent urllib.request.urlopen sends; some public front-ends throttle requests without one.
+REQUEST_HEADERS = {"User-Agent": f"Python-urllib/{urllib.request.__version__}"}
+
+# Idle keep-alive connections shared by all callers (HERE, OSRM), keyed by (scheme, host[:port]).
+# A connection is checked out for exactly one request, so threads never share one at a time.
+_idle_connections: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+_idle_connections_lock = threading.Lock()
+
+
+def _new_connection(scheme: str, netloc: str, timeout_sec: float) -> http.client.HTTPConnection:
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc, timeout=timeout_sec)
+    return http.client.HTTPConnection(netloc, timeout=timeout_sec)
+
+
+def _send_get(
+    connection: http.client.HTTPConnection, target: str
+) -> Tuple[http.client.HTTPResponse, bytes]:
+    try:
+        connection.request("GET", target, headers=REQUEST_HEADERS)
+        response = connection.getresponse()
+        return response, response.read()
+    except Exception:
+        connection.close()
+        raise
+
+
+def http_get_bytes(full_url: str, timeout_sec: float) -> bytes:
+    url = full_url
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or parts.scheme in urllib.request.getproxies():
+            # http.client does not do proxies; keep urllib's handling there.
+            with urllib.request.urlopen(url, timeout=timeout_sec) as response:
+                return response.read()
+
+        response, body = _pooled_get(parts, timeout_sec)
+        if 200 <= response.status < 300:
+            return body
+        location = response.headers.get("Location")
+        if response.status not in REDIRECT_STATUSES or not location:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+        # Follow redirects like urlopen did (e.g. http -> https on a configured OSRM base URL).
+        url = urllib.parse.urljoin(url, location)
+    raise urllib.error.HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+
+def _pooled_get(
+    parts: urllib.parse.SplitResult, timeout_sec: float
+) -> Tuple[http.client.HTTPResponse, bytes]:
+    key = (parts.scheme, parts.netloc)
+    target = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+    with _idle_connections_lock:
+        pool = _idle_connections.get(key)
+        connection = pool.pop() if pool else None
+
+    if connection is None:
+        connection = _new_connection(parts.scheme, parts.netloc, timeout_sec)
+        response, body = _send_get(connection, target)
+    else:
+        connection.timeout = timeout_sec
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout_sec)
+        try:
+            response, body = _send_get(connection, target)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server dropped the idle connection; retry once on a fresh one.
+            connection = _new_connection(parts.scheme, parts.netloc, timeout_sec)
+            response, body = _send_get(connection, target)
+
+    if response.will_close:
+        connection.close()
+    else:
+        with _idle_connections_lock:
+            pool = _idle_connections.setdefault(key, [])
+            keep = len(pool) < MAX_IDLE_CONNECTIONS_PER_HOST
+            if keep:
+                pool.append(connection)
+        if not keep:
+            connection.close()
+    return response, body
+
+
+@atexit.register
+def close_idle_connections() -> None:
+    with _idle_connections_lock:
+        pools = list(_idle_connections.values())
+        _idle_connections.clear()
+    for pool in pools:
+        for connection in pool:
+            connection.close()
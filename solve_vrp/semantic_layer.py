@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta, timezone
-import json
 import math
 import os
 import time
@@ -7,10 +6,10 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 import urllib.parse
 import urllib.request
 
-from solve_vrp.here_emulator import HerePlatformEmulator
-from solve_vrp.here_platform import HerePlatformClient
+from solve_vrp.http_pool import http_get_bytes, json_loads
 
 EARTH_RADIUS_KM = 6371.0
+_DEG_TO_RAD = math.pi / 180.0  # same factor math.radians applies
 
 DEFAULT_SEMANTIC_RADIUS_KM = 1.2
 DEFAULT_TOP_K = 8
@@ -209,14 +208,11 @@ def _haversine_km(
     point_a: Tuple[float, float],
     point_b: Tuple[float, float],
 ) -> float:
-    lat1, lon1 = map(math.radians, point_a)
-    lat2, lon2 = map(math.radians, point_b)
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    h = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    )
+    lat1 = point_a[0] * _DEG_TO_RAD
+    lat2 = point_b[0] * _DEG_TO_RAD
+    sin_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_dlon = math.sin((point_b[1] * _DEG_TO_RAD - point_a[1] * _DEG_TO_RAD) * 0.5)
+    h = sin_dlat**2 + math.cos(lat1) * math.cos(lat2) * sin_dlon**2
     return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(h))
 
 
@@ -274,7 +270,7 @@ def _query_overpass_json(query: str, timeout_sec: int) -> Dict[str, Any]:
                 method="POST",
             )
             with urllib.request.urlopen(request, timeout=max(2, timeout_sec)) as response:
-                payload = json.loads(response.read().decode("utf-8"))
+                payload = json_loads(response.read())
             if not isinstance(payload, dict):
                 raise RuntimeError("Unexpected Overpass payload.")
             remark = str(payload.get("remark") or "").strip()
@@ -635,7 +631,7 @@ def _reverse_geocode_stop_address(
                 method="GET",
             )
             with urllib.request.urlopen(request, timeout=max(2, timeout_sec)) as response:
-                payload = json.loads(response.read().decode("utf-8"))
+                payload = json_loads(response.read())
                 source_endpoint = endpoint
                 break
         except Exception as exc:  # noqa: BLE001
@@ -1134,7 +1130,7 @@ def _fetch_osrm_segment_geometry(
     ):
         raise RuntimeError("Invalid coordinates for OSRM route geometry.")
 
-    coords = f"{start_lng},{start_lat};{end_lng},{end_lat}"
+    coords = f"{start_lng:.6f},{start_lat:.6f};{end_lng:.6f},{end_lat:.6f}"
     encoded_coords = urllib.parse.quote(coords, safe=";,")
     base = str(osrm_base_url or "").strip().rstrip("/")
     if not base:
@@ -1148,8 +1144,7 @@ def _fetch_osrm_segment_geometry(
     last_error: Optional[str] = None
     for attempt in range(2):
         try:
-            with urllib.request.urlopen(url, timeout=max(2, timeout_sec)) as response:
-                payload = json.loads(response.read().decode("utf-8"))
+            payload = json_loads(http_get_bytes(url, max(2, timeout_sec)))
             break
         except Exception as exc:  # noqa: BLE001
             last_error = str(exc)
@@ -1375,7 +1370,7 @@ def _query_osm_municipality_candidates_batch(
                 method="POST",
             )
             with urllib.request.urlopen(request, timeout=max(2, timeout_sec)) as response:
-                payload = json.loads(response.read().decode("utf-8"))
+                payload = json_loads(response.read())
                 break
         except Exception as exc:  # noqa: BLE001
             last_error = f"{endpoint}: {exc}"
@@ -1504,21 +1499,21 @@ def _build_municipality_trace_for_segment(
     return output
 
 
-def _lat_lng_to_xy_km(lat: float, lng: float, ref_lat: float) -> Tuple[float, float]:
-    x = math.radians(lng) * EARTH_RADIUS_KM * math.cos(math.radians(ref_lat))
-    y = math.radians(lat) * EARTH_RADIUS_KM
-    return x, y
-
-
 def _point_to_segment_distance_km(
     point: Tuple[float, float],
     start: Tuple[float, float],
     end: Tuple[float, float],
 ) -> float:
+    # Equirectangular projection around the mean latitude; cos(ref_lat) is shared by all
+    # three points, so it is evaluated once instead of per point.
     ref_lat = (point[0] + start[0] + end[0]) / 3.0
-    px, py = _lat_lng_to_xy_km(point[0], point[1], ref_lat)
-    sx, sy = _lat_lng_to_xy_km(start[0], start[1], ref_lat)
-    ex, ey = _lat_lng_to_xy_km(end[0], end[1], ref_lat)
+    cos_ref = math.cos(ref_lat * _DEG_TO_RAD)
+    px = point[1] * _DEG_TO_RAD * EARTH_RADIUS_KM * cos_ref
+    py = point[0] * _DEG_TO_RAD * EARTH_RADIUS_KM
+    sx = start[1] * _DEG_TO_RAD * EARTH_RADIUS_KM * cos_ref
+    sy = start[0] * _DEG_TO_RAD * EARTH_RADIUS_KM
+    ex = end[1] * _DEG_TO_RAD * EARTH_RADIUS_KM * cos_ref
+    ey = end[0] * _DEG_TO_RAD * EARTH_RADIUS_KM
 
     vx = ex - sx
     vy = ey - sy
@@ -1596,10 +1591,36 @@ def _normalize_observations(raw_observations: Any) -> List[Dict[str, Any]]:
         row["lat"] = lat
         row["lng"] = lng
         row["_parsed_time"] = _parse_utc_datetime(raw.get("time_utc"))
+        # Radians and cos(lat) are reused by every segment match against this row.
+        row["_lat_rad"] = math.radians(lat)
+        row["_lng_rad"] = math.radians(lng)
+        row["_cos_lat"] = math.cos(row["_lat_rad"])
         normalized.append(row)
     return normalized
 
 
+def _route_bounding_box(
+    stops: List[Dict[str, Any]],
+    radius_km: float,
+) -> Tuple[float, float, float, float]:
+    # Conservative lat/lng box: the projected distance to any segment is at least the
+    # north-south gap, and at least the east-west gap scaled by the smallest cos(lat) in range.
+    km_per_degree = EARTH_RADIUS_KM * math.pi / 180.0
+    lats = [float(stop["lat"]) for stop in stops]
+    lngs = [float(stop["lng"]) for stop in stops]
+    lat_margin = (radius_km / km_per_degree) * 1.000001
+    lat_lo = min(lats) - lat_margin
+    lat_hi = max(lats) + lat_margin
+    min_cos = min(
+        math.cos(math.radians(max(-90.0, lat_lo))),
+        math.cos(math.radians(min(90.0, lat_hi))),
+    )
+    if min_cos <= 0.0:
+        return lat_lo, lat_hi, float("-inf"), float("inf")
+    lng_margin = (radius_km / (km_per_degree * min_cos)) * 1.000001
+    return lat_lo, lat_hi, min(lngs) - lng_margin, max(lngs) + lng_margin
+
+
 def _distance_to_route_km(
     location: Dict[str, Any],
     stops: List[Dict[str, Any]],
@@ -1634,9 +1655,15 @@ def _match_observation(
     best_time_offset_min = None
     best_score = None
 
-    midpoint = (segment_midpoint["lat"], segment_midpoint["lng"])
+    mid_lat = math.radians(segment_midpoint["lat"])
+    mid_lng = math.radians(segment_midpoint["lng"])
+    mid_cos = math.cos(mid_lat)
     for obs in observations:
-        distance_km = _haversine_km(midpoint, (obs["lat"], obs["lng"]))
+        h = (
+            math.sin((obs["_lat_rad"] - mid_lat) / 2) ** 2
+            + mid_cos * obs["_cos_lat"] * math.sin((obs["_lng_rad"] - mid_lng) / 2) ** 2
+        )
+        distance_km = EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(h))
         obs_time = obs.get("_parsed_time")
         if target_time_utc is not None and obs_time is not None:
             time_offset_min = abs((obs_time - target_time_utc).total_seconds()) / 60.0
@@ -1830,8 +1857,11 @@ def _semantic_locations_for_route(
     if len(stops) < 2 or not candidate_locations:
         return []
 
+    lat_lo, lat_hi, lng_lo, lng_hi = _route_bounding_box(stops, radius_km)
     scored = []
     for location in candidate_locations:
+        if not (lat_lo <= location["lat"] <= lat_hi and lng_lo <= location["lng"] <= lng_hi):
+            continue
         distance_km, nearest_segment_index = _distance_to_route_km(location, stops)
         if math.isinf(distance_km) or distance_km > radius_km:
             continue
@@ -1995,7 +2025,10 @@ def build_semantic_layer(
         and distance_source.startswith("osrm")
     )
     here_client = None
+    # Client modules are imported on demand so requests without HERE never load them.
     if here_enabled and here_data_source == "emulator":
+        from solve_vrp.here_emulator import HerePlatformEmulator
+
         here_client = HerePlatformEmulator(
             timeout_sec=here_timeout_sec,
             traffic_radius_m=here_traffic_radius_m,
@@ -2004,6 +2037,8 @@ def build_semantic_layer(
             seed=raw_payload.get("here_emulator_seed"),
         )
     elif here_enabled and here_data_source == "here":
+        from solve_vrp.here_platform import HerePlatformClient
+
         here_client = HerePlatformClient(
             api_key=here_api_key,
             timeout_sec=here_timeout_sec,
@@ -0,0 +1,208 @@
+import itertools
+import math
+import random
+import time
+import unittest
+from unittest import mock
+
+from solve_vrp import (
+    _fetch_osrm_table_km,
+    _improve_route_sequence,
+    _or_opt_sequence,
+    _sequence_cost,
+    _two_opt_sequence,
+    solve_vrp_nearest_neighbor,
+)
+
+DEPOT = {"id": "depot", "lat": 40.4, "lng": -3.7}
+
+# Fixed instance on which 2-opt/Or-opt and multi-start all shorten the plan.
+FIXED_POINTS = [
+    (40.58, -4.28, 1), (40.74, -2.93, 3), (39.6, -4.06, 2), (41.48, -3.85, 2),
+    (39.55, -2.5, 4), (41.44, -3.36, 1), (40.3, -4.38, 3), (41.03, -3.59, 3),
+    (40.78, -2.76, 1), (40.73, -2.67, 2), (41.16, -2.81, 3), (40.51, -4.65, 3),
+    (39.74, -4.93, 3), (39.86, -3.39, 4),
+]
+FIXED_CUSTOMERS = [
+    {"id": i + 1, "lat": lat, "lng": lng, "demand": demand}
+    for i, (lat, lng, demand) in enumerate(FIXED_POINTS)
+]
+# Plain Clarke & Wright output of the original solver for FIXED_CUSTOMERS, 3 vehicles, capacity 12.
+BASELINE_STOP_IDS = [
+    ["depot", 1, 7, 12, 13, 3, "depot"],
+    ["depot", 2, 10, 9, 11, 6, 4, "depot"],
+    ["depot", 14, 5, 8, "depot"],
+]
+BASELINE_DISTANCES_KM = [376.952, 366.35, 408.569]
+BASELINE_TOTAL_KM = 1151.871
+
+OPTION_COMBOS = [
+    dict(two_opt=two_opt, or_opt=or_opt, multi_start=multi_start)
+    for two_opt, or_opt, multi_start in itertools.product((False, True), repeat=3)
+]
+
+
+def _random_customers(rng, count):
+    return [
+        {
+            "id": i,
+            "lat": round(rng.uniform(39.5, 41.5), 4),
+            "lng": round(rng.uniform(-5.0, -2.5), 4),
+            "demand": rng.randint(1, 4),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _random_sequence_instance(rng):
+    # Depot-to-depot sequence over an asymmetric matrix, like an OSRM table.
+    size = rng.randint(2, 12)
+    matrix = [[0.0 if a == b else rng.uniform(1.0, 100.0) for b in range(size)] for a in range(size)]
+    customers = list(range(1, size))
+    rng.shuffle(customers)
+    return [0] + customers + [0], matrix
+
+
+def _customer_sets(result):
+    return {
+        frozenset(route["served_customer_ids"]): route["distance_km"]
+        for route in result["routes"]
+        if route["served_customer_ids"]
+    }
+
+
+class BaselineTests(unittest.TestCase):
+    def test_without_polish_reproduces_baseline_routes(self):
+        result = solve_vrp_nearest_neighbor(
+            DEPOT, FIXED_CUSTOMERS, 3, 12, two_opt=False, or_opt=False, multi_start=False
+        )
+        self.assertEqual(
+            [[stop["id"] for stop in route["stops"]] for route in result["routes"]],
+            BASELINE_STOP_IDS,
+        )
+        self.assertEqual([route["distance_km"] for route in result["routes"]], BASELINE_DISTANCES_KM)
+        self.assertEqual(result["summary"]["total_distance_km"], BASELINE_TOTAL_KM)
+        self.assertEqual(result["unserved_customer_ids"], [])
+
+    def test_polish_and_multi_start_shorten_fixed_instance(self):
+        polished = solve_vrp_nearest_neighbor(DEPOT, FIXED_CUSTOMERS, 3, 12)
+        multi = solve_vrp_nearest_neighbor(DEPOT, FIXED_CUSTOMERS, 3, 12, multi_start=True)
+        self.assertLess(polished["summary"]["total_distance_km"], BASELINE_TOTAL_KM)
+        self.assertLess(multi["summary"]["total_distance_km"], polished["summary"]["total_distance_km"])
+
+
+class PolishTests(unittest.TestCase):
+    def assertPolished(self, improved, sequence, matrix):
+        self.assertEqual(improved[0], 0)
+        self.assertEqual(improved[-1], 0)
+        self.assertEqual(sorted(improved), sorted(sequence))
+        self.assertLessEqual(_sequence_cost(improved, matrix), _sequence_cost(sequence, matrix) + 1e-9)
+
+    def test_two_opt_never_lengthens_sequence(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            sequence, matrix = _random_sequence_instance(rng)
+            self.assertPolished(_two_opt_sequence(sequence, matrix), sequence, matrix)
+
+    def test_or_opt_never_lengthens_sequence(self):
+        rng = random.Random(13)
+        for _ in range(200):
+            sequence, matrix = _random_sequence_instance(rng)
+            self.assertPolished(_or_opt_sequence(sequence, matrix), sequence, matrix)
+
+    def test_improve_never_lengthens_sequence(self):
+        rng = random.Random(17)
+        for _ in range(200):
+            sequence, matrix = _random_sequence_instance(rng)
+            for two_opt, or_opt in ((True, False), (False, True), (True, True)):
+                self.assertPolished(
+                    _improve_route_sequence(sequence, matrix, two_opt, or_opt), sequence, matrix
+                )
+
+    def test_polished_routes_never_longer_than_unpolished(self):
+        rng = random.Random(11)
+        for _ in range(25):
+            customers = _random_customers(rng, rng.randint(5, 35))
+            vehicles = rng.randint(2, 6)
+            capacity = rng.randint(6, 20)
+            plain = solve_vrp_nearest_neighbor(
+                DEPOT, customers, vehicles, capacity, two_opt=False, or_opt=False
+            )
+            plain_routes = _customer_sets(plain)
+            for two_opt, or_opt in ((True, False), (False, True), (True, True)):
+                polished = solve_vrp_nearest_neighbor(
+                    DEPOT, customers, vehicles, capacity, two_opt=two_opt, or_opt=or_opt
+                )
+                polished_routes = _customer_sets(polished)
+                # Polishing reorders stops within a route; it never moves customers between routes.
+                self.assertEqual(set(polished_routes), set(plain_routes))
+                for served, distance_km in polished_routes.items():
+                    self.assertLessEqual(distance_km, plain_routes[served])
+
+    def test_long_route_polish_stays_fast(self):
+        # One vehicle with room for everyone gives a single 600-stop route; unbounded 2-opt
+        # took several times the savings build on it.
+        customers = _random_customers(random.Random(5), 600)
+        started = time.perf_counter()
+        solve_vrp_nearest_neighbor(DEPOT, customers, 1, 10**6, two_opt=False, or_opt=False)
+        plain_sec = time.perf_counter() - started
+        started = time.perf_counter()
+        result = solve_vrp_nearest_neighbor(DEPOT, customers, 1, 10**6)
+        polished_sec = time.perf_counter() - started
+        self.assertEqual(len(result["routes"][0]["served_customer_ids"]), 600)
+        self.assertLess(polished_sec, 2 * plain_sec + 0.25)
+
+
+class CapacityTests(unittest.TestCase):
+    def test_route_loads_within_capacity(self):
+        rng = random.Random(23)
+        for _ in range(15):
+            customers = _random_customers(rng, rng.randint(1, 30))
+            demand_by_id = {customer["id"]: customer["demand"] for customer in customers}
+            vehicles = rng.randint(1, 5)
+            capacity = rng.randint(3, 15)
+            for options in OPTION_COMBOS:
+                result = solve_vrp_nearest_neighbor(DEPOT, customers, vehicles, capacity, **options)
+                served = []
+                for route in result["routes"]:
+                    load = sum(demand_by_id[customer_id] for customer_id in route["served_customer_ids"])
+                    self.assertLessEqual(load, capacity)
+                    self.assertEqual(route["used"], load)
+                    served.extend(route["served_customer_ids"])
+                self.assertEqual(len(served), len(set(served)))
+                self.assertEqual(
+                    sorted(served + result["unserved_customer_ids"]), sorted(demand_by_id)
+                )
+
+    def test_multi_start_never_serves_fewer_or_drives_longer(self):
+        rng = random.Random(31)
+        for _ in range(15):
+            customers = _random_customers(rng, rng.randint(5, 30))
+            vehicles = rng.randint(1, 5)
+            capacity = rng.randint(4, 15)
+            single = solve_vrp_nearest_neighbor(DEPOT, customers, vehicles, capacity)
+            multi = solve_vrp_nearest_neighbor(
+                DEPOT, customers, vehicles, capacity, multi_start=True
+            )
+            # The first multi-start shape is the single-start build, so the kept plan is never worse.
+            self.assertLessEqual(multi["summary"]["unserved"], single["summary"]["unserved"])
+            if multi["summary"]["unserved"] == single["summary"]["unserved"]:
+                self.assertLessEqual(
+                    multi["summary"]["total_distance_km"],
+                    single["summary"]["total_distance_km"] + 1e-3,
+                )
+
+
+class OsrmTableTests(unittest.TestCase):
+    def test_missing_cells_become_unreachable(self):
+        table = {"code": "Ok", "distances": [[0, None, 1500], [float("nan"), 0, float("-inf")], [2000, 500, 0]]}
+        with mock.patch("solve_vrp.http_get_bytes", return_value=b""), mock.patch(
+            "solve_vrp.json_loads", return_value=table
+        ):
+            matrix_km, warning = _fetch_osrm_table_km("http://osrm.invalid/table")
+        self.assertIsNone(warning)
+        self.assertEqual(matrix_km, [[0.0, math.inf, 1.5], [math.inf, 0.0, math.inf], [2.0, 0.5, 0.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()